@@ -0,0 +1,427 @@
+"""
+HealthGuard360 AI Analysis Stage Emulator
+Local stand-in for the Gemini compliance analysis backend, plus the bounded-concurrency,
+batching, retrying and circuit-breaking client the scan pipeline uses to talk to it.
+All timings are in emulated milliseconds; `time_scale` compresses them onto the wall
+clock so an hour of scanning can be measured in seconds.
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from workload import sample_distribution, sample_numeric_distribution, validate_distribution
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# README performance targets for the compliance scan stage
+TARGET_SCANS_PER_HOUR = 1000
+TARGET_SCAN_LATENCY_MS = 5000
+TARGET_SCAN_ERROR_RATE = 0.05
+
+DEFAULT_AI_BACKEND_CONFIG: Dict[str, Any] = {
+    "latency_ms": {"distribution": "lognormal", "median": 3000, "sigma": 0.35, "min": 200, "max": 30000},
+    "per_document_ms": 150,
+    "per_1k_words_ms": 250,
+    "max_concurrency": 8,
+    "rate_limit_per_minute": 60,
+    "max_batch_size": 8,
+    "error_rate": 0.02,
+}
+
+DEFAULT_AI_CLIENT_CONFIG: Dict[str, Any] = {
+    "max_concurrency": 8,
+    "batch_size": 4,
+    "batch_wait_ms": 250,
+    "timeout_ms": 15000,
+    "max_retries": 3,
+    "backoff_base_ms": 500,
+    "backoff_max_ms": 10000,
+    "circuit_failure_threshold": 5,
+    "circuit_reset_timeout_ms": 10000,
+}
+
+# ============================================================================
+# ERRORS
+# ============================================================================
+
+class AIBackendError(Exception):
+    """Base error raised by the emulated AI analysis stage"""
+    retriable = True
+
+
+class RateLimitError(AIBackendError):
+    """Backend rejected the request because a rate or concurrency limit was hit"""
+
+    def __init__(self, message: str, retry_after_ms: float = 0.0):
+        super().__init__(message)
+        self.retry_after_ms = retry_after_ms
+
+
+class TransientBackendError(AIBackendError):
+    """Injected backend failure that may succeed on retry"""
+
+
+class CircuitOpenError(AIBackendError):
+    """Client refused the request because the circuit breaker is open"""
+    retriable = False
+
+# ============================================================================
+# EMULATED BACKEND
+# ============================================================================
+
+class EmulatedClock:
+    """Emulated millisecond clock mapped onto the wall clock by `time_scale`"""
+
+    def __init__(self, time_scale: float = 0.01):
+        if time_scale <= 0:
+            raise ValueError("time_scale must be positive")
+        self.time_scale = time_scale
+        self._start = time.perf_counter()
+
+    def now_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000 / self.time_scale
+
+    async def sleep(self, duration_ms: float) -> None:
+        await asyncio.sleep(max(duration_ms, 0) * self.time_scale / 1000)
+
+
+class EmulatedAIBackend:
+    """Stand-in for the Gemini analysis API with configurable latency, limits and errors"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, clock: Optional[EmulatedClock] = None, seed: Optional[int] = None):
+        self.config = {**DEFAULT_AI_BACKEND_CONFIG, **(config or {})}
+        validate_distribution("latency_ms", self.config["latency_ms"], numeric=True)
+        self.clock = clock or EmulatedClock()
+        self.rng = np.random.default_rng(seed)
+        self.in_flight = 0
+        # Token bucket refilled continuously at rate_limit_per_minute
+        self._bucket_capacity = float(self.config["rate_limit_per_minute"] or 0)
+        self._tokens = self._bucket_capacity
+        self._last_refill_ms = self.clock.now_ms()
+        self.stats = {"requests": 0, "documents": 0, "rate_limited": 0, "errors": 0}
+
+    def _take_token(self) -> None:
+        if not self._bucket_capacity:
+            return
+        now = self.clock.now_ms()
+        refill_per_ms = self._bucket_capacity / 60000
+        self._tokens = min(self._bucket_capacity, self._tokens + (now - self._last_refill_ms) * refill_per_ms)
+        self._last_refill_ms = now
+        if self._tokens < 1:
+            self.stats["rate_limited"] += 1
+            raise RateLimitError("rate limit exceeded", retry_after_ms=(1 - self._tokens) / refill_per_ms)
+        self._tokens -= 1
+
+    async def analyze_batch(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Analyse a batch of documents, returning one result per document"""
+        if len(documents) > self.config["max_batch_size"]:
+            raise ValueError(f"Batch of {len(documents)} exceeds max_batch_size {self.config['max_batch_size']}")
+        self.stats["requests"] += 1
+        if self.in_flight >= self.config["max_concurrency"]:
+            self.stats["rate_limited"] += 1
+            raise RateLimitError("too many concurrent requests")
+        self._take_token()
+
+        self.in_flight += 1
+        try:
+            word_count = sum(len(doc.get("content", "").split()) for doc in documents)
+            latency = float(sample_numeric_distribution(self.rng, self.config["latency_ms"], 1)[0])
+            latency += self.config["per_document_ms"] * len(documents)
+            latency += self.config["per_1k_words_ms"] * word_count / 1000
+            if self.rng.random() < self.config["error_rate"]:
+                # Failures surface part-way through the request, like a dropped upstream call
+                await self.clock.sleep(latency * self.rng.uniform(0.1, 1.0))
+                self.stats["errors"] += 1
+                raise TransientBackendError("injected AI backend failure")
+            await self.clock.sleep(latency)
+        finally:
+            self.in_flight -= 1
+
+        self.stats["documents"] += len(documents)
+        return [
+            {
+                "document_id": doc["document_id"],
+                "issues_found": len([word for word in doc.get("content", "").lower().split() if word in ['patient', 'medical', 'health']]),
+                "backend_latency_ms": round(latency, 2),
+                "batch_size": len(documents),
+            }
+            for doc in documents
+        ]
+
+# ============================================================================
+# RESILIENT CLIENT
+# ============================================================================
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe"""
+
+    def __init__(self, failure_threshold: int, reset_timeout_ms: float, clock: EmulatedClock):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_ms = reset_timeout_ms
+        self.clock = clock
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at_ms = 0.0
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and self.clock.now_ms() - self.opened_at_ms >= self.reset_timeout_ms:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_throttle(self) -> None:
+        """Rate limiting is backpressure, not a health failure: just free the probe slot"""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self.state = "open"
+            self.opened_at_ms = self.clock.now_ms()
+
+
+class AIAnalysisClient:
+    """Scan pipeline client: batches requests, caps concurrency, retries and breaks circuits"""
+
+    def __init__(self, backend: EmulatedAIBackend, config: Optional[Dict[str, Any]] = None, seed: Optional[int] = None):
+        self.backend = backend
+        self.clock = backend.clock
+        self.config = {**DEFAULT_AI_CLIENT_CONFIG, **(config or {})}
+        self.config["batch_size"] = min(self.config["batch_size"], backend.config["max_batch_size"])
+        self.rng = np.random.default_rng(seed)
+        self.breaker = CircuitBreaker(self.config["circuit_failure_threshold"], self.config["circuit_reset_timeout_ms"], self.clock)
+        self.stats = {"batches": 0, "attempts": 0, "retries": 0, "timeouts": 0, "circuit_rejections": 0}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._dispatches: set = set()
+
+    async def start(self) -> None:
+        self._semaphore = asyncio.Semaphore(self.config["max_concurrency"])
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+
+    async def close(self) -> None:
+        """Flush queued requests, wait for in-flight batches and stop the batcher"""
+        if self._batcher is None:
+            return
+        await self._queue.join()
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+        self._batcher = None
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+
+    async def analyze(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Submit one document and wait for its analysis result"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((document, future))
+        return await future
+
+    async def _batch_loop(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self.clock.now_ms() + self.config["batch_wait_ms"]
+            while len(batch) < self.config["batch_size"]:
+                remaining = deadline - self.clock.now_ms()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining * self.clock.time_scale / 1000))
+                except asyncio.TimeoutError:
+                    break
+            dispatch = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(dispatch)
+            dispatch.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Any]) -> None:
+        documents = [document for document, _ in batch]
+        try:
+            results = await self._call_with_retries(documents)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _call_with_retries(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self.stats["batches"] += 1
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                # Checked once a slot is free: the circuit may have opened while this batch queued
+                if not self.breaker.allow():
+                    self.stats["circuit_rejections"] += 1
+                    raise CircuitOpenError("AI analysis circuit is open")
+                self.stats["attempts"] += 1
+                try:
+                    results = await asyncio.wait_for(
+                        self.backend.analyze_batch(documents),
+                        self.config["timeout_ms"] * self.clock.time_scale / 1000
+                    )
+                    self.breaker.record_success()
+                    return results
+                except asyncio.TimeoutError:
+                    self.stats["timeouts"] += 1
+                    error: AIBackendError = TransientBackendError("AI analysis request timed out")
+                except AIBackendError as exc:
+                    error = exc
+                if isinstance(error, RateLimitError):
+                    self.breaker.record_throttle()
+                else:
+                    self.breaker.record_failure()
+            if attempt >= self.config["max_retries"] or not error.retriable:
+                raise error
+            backoff = min(self.config["backoff_max_ms"], self.config["backoff_base_ms"] * 2 ** attempt)
+            backoff *= self.rng.uniform(0.5, 1.0)
+            if isinstance(error, RateLimitError):
+                backoff = max(backoff, error.retry_after_ms)
+            attempt += 1
+            self.stats["retries"] += 1
+            await self.clock.sleep(backoff)
+
+# ============================================================================
+# SCAN THROUGHPUT LOAD TEST
+# ============================================================================
+
+async def analyze_documents_async(
+    documents: List[Dict[str, Any]],
+    backend_config: Optional[Dict[str, Any]] = None,
+    client_config: Optional[Dict[str, Any]] = None,
+    arrivals_ms: Optional[np.ndarray] = None,
+    time_scale: float = 0.01,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """Send documents through AIAnalysisClient against a fresh emulated backend.
+
+    Each document is submitted at its `arrivals_ms` offset (all at once if omitted).
+    Returns one result per document, in order, with its measured latency and status,
+    plus the run's elapsed time and client/backend counters.
+    """
+    clock = EmulatedClock(time_scale)
+    backend = EmulatedAIBackend(backend_config, clock, seed=seed + 1)
+    client = AIAnalysisClient(backend, client_config, seed=seed + 2)
+    results: List[Dict[str, Any]] = [{} for _ in documents]
+
+    async def submit(index: int) -> None:
+        if arrivals_ms is not None:
+            await clock.sleep(arrivals_ms[index] - clock.now_ms())
+        submitted = clock.now_ms()
+        try:
+            analysis = await client.analyze(documents[index])
+            results[index] = {**analysis, "status": "success", "error": None}
+        except AIBackendError as exc:
+            results[index] = {"document_id": documents[index]["document_id"], "issues_found": 0, "status": "failed", "error": type(exc).__name__}
+        results[index]["latency_ms"] = round(clock.now_ms() - submitted, 2)
+
+    await client.start()
+    started = clock.now_ms()
+    await asyncio.gather(*(submit(index) for index in range(len(documents))))
+    await client.close()
+    return {
+        "results": results,
+        "elapsed_ms": clock.now_ms() - started,
+        "client": dict(client.stats, circuit_opens=client.breaker.times_opened),
+        "backend": dict(backend.stats),
+    }
+
+
+def analyze_documents(documents: List[Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+    """Synchronous wrapper around analyze_documents_async"""
+    return asyncio.run(analyze_documents_async(documents, **kwargs))
+
+
+async def run_scan_load_test_async(
+    num_scans: int = 200,
+    backend_config: Optional[Dict[str, Any]] = None,
+    client_config: Optional[Dict[str, Any]] = None,
+    arrival_rate_per_hour: Optional[float] = None,
+    document_length: Optional[Dict[str, Any]] = None,
+    time_scale: float = 0.01,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """Push `num_scans` compliance scans through the emulated AI stage and measure them.
+
+    With no `arrival_rate_per_hour` every scan is submitted at once to find the
+    saturated throughput. Queueing then dominates latency, so the latency target is
+    only judged (`meets_latency_target` not None) when scans arrive as a Poisson
+    process at the given rate.
+    """
+    rng = np.random.default_rng(seed)
+    length_dist = document_length or {"distribution": "lognormal", "median": 400, "sigma": 0.8, "min": 10, "max": 20000, "integer": True}
+    word_counts = sample_distribution(rng, length_dist, num_scans)
+    arrivals_ms = None
+    if arrival_rate_per_hour:
+        arrivals_ms = np.cumsum(rng.exponential(3600000 / arrival_rate_per_hour, num_scans))
+    words = "patient medical record health policy access audit".split()
+    documents = [
+        {"document_id": f"doc_{index}", "content": " ".join(words[i % len(words)] for i in range(int(word_counts[index])))}
+        for index in range(num_scans)
+    ]
+    run = await analyze_documents_async(documents, backend_config, client_config, arrivals_ms, time_scale, seed)
+
+    elapsed_ms = run["elapsed_ms"]
+    failures: Dict[str, int] = {}
+    for result in run["results"]:
+        if result["status"] != "success":
+            failures[result["error"]] = failures.get(result["error"], 0) + 1
+    completed = np.asarray([result["latency_ms"] for result in run["results"] if result["status"] == "success"], dtype=np.float64)
+    scans_per_hour = len(completed) / (elapsed_ms / 3600000) if elapsed_ms > 0 else 0.0
+    percentiles = np.percentile(completed, [50, 95, 99]) if len(completed) else [0.0, 0.0, 0.0]
+    error_rate = (num_scans - len(completed)) / num_scans if num_scans else 0.0
+    meets_latency_target = None
+    if arrival_rate_per_hour:
+        meets_latency_target = bool(len(completed)) and float(percentiles[1]) <= TARGET_SCAN_LATENCY_MS
+    return {
+        "total_scans": num_scans,
+        "completed_scans": int(len(completed)),
+        "failed_scans": int(num_scans - len(completed)),
+        "failures_by_type": failures,
+        "elapsed_ms": round(elapsed_ms, 2),
+        "scans_per_hour": round(scans_per_hour, 2),
+        "latency_ms": {
+            "p50": round(float(percentiles[0]), 2),
+            "p95": round(float(percentiles[1]), 2),
+            "p99": round(float(percentiles[2]), 2),
+            "max": round(float(completed.max()), 2) if len(completed) else 0.0,
+        },
+        "error_rate": round(error_rate, 4),
+        "average_batch_size": round(num_scans / run["client"]["batches"], 2) if run["client"]["batches"] else 0.0,
+        "client": run["client"],
+        "backend": run["backend"],
+        "meets_throughput_target": scans_per_hour >= TARGET_SCANS_PER_HOUR,
+        "meets_latency_target": meets_latency_target,
+        "meets_error_target": error_rate < TARGET_SCAN_ERROR_RATE,
+    }
+
+
+def run_scan_load_test(**kwargs: Any) -> Dict[str, Any]:
+    """Synchronous wrapper around run_scan_load_test_async"""
+    return asyncio.run(run_scan_load_test_async(**kwargs))
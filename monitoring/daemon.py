@@ -0,0 +1,424 @@
+"""
+HealthGuard360 Continuous Monitoring Daemon
+Runs the monitoring flows on a schedule or in a continuous loop for days at a time.
+Flow results are folded into fixed-size aggregation windows and spilled to rotating
+files, so resident memory stays bounded no matter how long the daemon runs.
+"""
+
+import gc
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+import numpy as np
+
+from healthguard_flows import monitor_complete_user_journey, performance_testing_flow, ai_scan_throughput_flow
+
+logger = logging.getLogger("healthguard360.daemon")
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DEFAULT_DAEMON_CONFIG: Dict[str, Any] = {
+    "flows": ["journey", "performance"],
+    "interval_seconds": 60,            # 0 runs the flows back-to-back in a continuous loop
+    "window_seconds": 300,
+    "max_windows_in_memory": 288,
+    "health_interval_seconds": 60,
+    "output_dir": "monitoring_output",
+    "spill_max_bytes": 10 * 1024 * 1024,
+    "spill_max_files": 10,
+    "performance_users": 3,
+    "performance_operations_per_user": 5,
+    "ai_scans": 50,
+    "use_ai_client": False,            # route performance-flow compliance scans through AIAnalysisClient
+    "seed": 42,
+    "soak_hours": None,                # set to stop after this long and write a drift report
+    "soak_warmup_windows": 2,          # imports, caches and the Prefect client settle in these
+    "soak_rss_slope_threshold_mb_per_hour": 5.0,
+    "soak_rss_min_growth_mb": 20.0,    # ignore slopes fitted to small absolute growth on short soaks
+    "soak_latency_drift_threshold_pct": 25.0,
+}
+
+# ============================================================================
+# FLOW RUNNERS
+# ============================================================================
+
+def run_journey_iteration(config: Dict[str, Any], iteration: int) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+    result = monitor_complete_user_journey(user_id=f"daemon_user_{iteration % 100}")
+    return result["flow_data"], {}
+
+
+def run_performance_iteration(config: Dict[str, Any], iteration: int) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+    result = performance_testing_flow(
+        num_users=config["performance_users"],
+        operations_per_user=config["performance_operations_per_user"],
+        seed=config["seed"] + iteration,
+        use_ai_client=config["use_ai_client"]
+    )
+    gauges = {"average_think_time_ms": result["performance_metrics"]["average_think_time_ms"]}
+    if result["ai_analysis"]:
+        gauges["ai_failed_scans"] = result["ai_analysis"]["failed_scans"]
+    return result["flow_data"], gauges
+
+
+def run_ai_scan_iteration(config: Dict[str, Any], iteration: int) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+    result = ai_scan_throughput_flow(num_scans=config["ai_scans"], seed=config["seed"] + iteration)
+    return [], {"scans_per_hour": result["scans_per_hour"], "scan_p95_ms": result["latency_ms"]["p95"]}
+
+
+# Each runner returns the flow's events plus any gauges worth tracking per window
+FLOW_RUNNERS: Dict[str, Callable[[Dict[str, Any], int], Tuple[List[Dict[str, Any]], Dict[str, float]]]] = {
+    "journey": run_journey_iteration,
+    "performance": run_performance_iteration,
+    "ai_scan": run_ai_scan_iteration,
+}
+
+# ============================================================================
+# BOUNDED AGGREGATION
+# ============================================================================
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident set size in MB, or None where it cannot be read"""
+    try:
+        with open("/proc/self/status", "r") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 2)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is the peak, not current, RSS: KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 2)
+
+
+class LatencyHistogram:
+    """Fixed-size log-bucketed latency histogram: constant memory, approximate percentiles"""
+
+    def __init__(self, min_ms: float = 0.1, max_ms: float = 3600000.0, buckets: int = 256):
+        self.edges = np.geomspace(min_ms, max_ms, buckets + 1)
+        self.counts = np.zeros(buckets + 2, dtype=np.int64)
+        self.total = 0.0
+
+    def add(self, values: List[float]) -> None:
+        if not values:
+            return
+        samples = np.asarray(values, dtype=np.float64)
+        np.add.at(self.counts, np.searchsorted(self.edges, samples, side="right"), 1)
+        self.total += float(samples.sum())
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def percentile(self, q: float) -> float:
+        count = self.count
+        if not count:
+            return 0.0
+        bucket = int(np.searchsorted(np.cumsum(self.counts), np.ceil(count * q / 100)))
+        # Report the upper edge of the bucket the percentile falls in
+        return round(float(self.edges[min(bucket, len(self.edges) - 1)]), 2)
+
+    def summary(self) -> Dict[str, float]:
+        count = self.count
+        return {
+            "count": count,
+            "mean": round(self.total / count, 2) if count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class AggregationWindow:
+    """Rolls flow runs and their events up into counters and histograms"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.started_at = datetime.now().isoformat()
+        self.started_monotonic = time.monotonic()
+        self.flow_runs: Counter = Counter()
+        self.flow_failures: Counter = Counter()
+        self.events_by_component: Counter = Counter()
+        self.events_by_status: Counter = Counter()
+        self.flow_latency = LatencyHistogram()
+        self.event_latency = LatencyHistogram()
+        self.gauges: Dict[str, float] = {}
+        self.peak_rss_mb: Optional[float] = None
+        self.rss_after_gc_mb: Optional[float] = None
+
+    def record_flow(self, flow_name: str, wall_ms: float, events: List[Dict[str, Any]], gauges: Dict[str, float], failed: bool = False) -> None:
+        self.flow_runs[flow_name] += 1
+        if failed:
+            self.flow_failures[flow_name] += 1
+        self.flow_latency.add([wall_ms])
+        self.event_latency.add([event.get("duration_ms", 0) for event in events])
+        self.events_by_component.update(event.get("component", "unknown") for event in events)
+        self.events_by_status.update(event.get("status", "unknown") for event in events)
+        self.gauges.update({f"{flow_name}.{name}": value for name, value in gauges.items()})
+
+    def sample_memory(self) -> None:
+        rss = current_rss_mb()
+        if rss is not None and (self.peak_rss_mb is None or rss > self.peak_rss_mb):
+            self.peak_rss_mb = rss
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "window": self.index,
+            "started_at": self.started_at,
+            "ended_at": datetime.now().isoformat(),
+            "duration_seconds": round(time.monotonic() - self.started_monotonic, 2),
+            "flow_runs": dict(self.flow_runs),
+            "flow_failures": dict(self.flow_failures),
+            "flow_latency_ms": self.flow_latency.summary(),
+            "event_latency_ms": self.event_latency.summary(),
+            "events_by_component": dict(self.events_by_component),
+            "events_by_status": dict(self.events_by_status),
+            "gauges": dict(self.gauges),
+            "peak_rss_mb": self.peak_rss_mb,
+            "rss_after_gc_mb": self.rss_after_gc_mb,
+        }
+
+# ============================================================================
+# SOAK ANALYSIS
+# ============================================================================
+
+def soak_report(samples: List[Dict[str, float]], config: Dict[str, Any]) -> Dict[str, Any]:
+    """Fit linear drift of memory and flow latency across window samples.
+
+    Memory is the RSS read right after gc.collect() when each window closes, so a
+    single spike from not-yet-collected garbage does not move the fit.
+    """
+    samples = samples[config["soak_warmup_windows"]:]
+    report: Dict[str, Any] = {"windows": len(samples), "warmup_windows_skipped": config["soak_warmup_windows"]}
+    if len(samples) < 2:
+        report["verdict"] = "insufficient_data"
+        return report
+    hours = np.asarray([sample["elapsed_hours"] for sample in samples])
+    rss = np.asarray([sample["rss_mb"] for sample in samples], dtype=np.float64)
+    p95 = np.asarray([sample["flow_p95_ms"] for sample in samples], dtype=np.float64)
+    rss_slope = float(np.polyfit(hours, rss, 1)[0]) if np.ptp(hours) > 0 else 0.0
+    p95_slope = float(np.polyfit(hours, p95, 1)[0]) if np.ptp(hours) > 0 else 0.0
+    # Compare the first and last quarter of the run to smooth out single noisy windows
+    quarter = max(len(samples) // 4, 1)
+    p95_start, p95_end = float(p95[:quarter].mean()), float(p95[-quarter:].mean())
+    latency_drift_pct = (p95_end - p95_start) / p95_start * 100 if p95_start else 0.0
+    leak_suspected = (
+        rss_slope > config["soak_rss_slope_threshold_mb_per_hour"]
+        and float(rss[-1] - rss[0]) > config["soak_rss_min_growth_mb"]
+    )
+    latency_degraded = latency_drift_pct > config["soak_latency_drift_threshold_pct"]
+    report.update({
+        "duration_hours": round(float(hours[-1] - hours[0]), 3),
+        "rss_mb": {"start": round(float(rss[0]), 2), "end": round(float(rss[-1]), 2), "max": round(float(rss.max()), 2)},
+        "rss_slope_mb_per_hour": round(rss_slope, 3),
+        "flow_p95_ms": {"start": round(p95_start, 2), "end": round(p95_end, 2)},
+        "flow_p95_slope_ms_per_hour": round(p95_slope, 3),
+        "flow_p95_drift_pct": round(latency_drift_pct, 2),
+        "leak_suspected": leak_suspected,
+        "latency_degraded": latency_degraded,
+        "verdict": "leak_suspected" if leak_suspected else "latency_degraded" if latency_degraded else "stable",
+    })
+    return report
+
+# ============================================================================
+# DAEMON
+# ============================================================================
+
+class MonitoringDaemon:
+    """Long-running monitoring loop with window rotation, health snapshots and graceful shutdown"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = {**DEFAULT_DAEMON_CONFIG, **(config or {})}
+        unknown = [name for name in self.config["flows"] if name not in FLOW_RUNNERS]
+        if unknown:
+            raise ValueError(f"Unknown daemon flows {unknown}, expected any of {list(FLOW_RUNNERS)}")
+        if self.config["soak_hours"]:
+            # The drift fit needs at least two windows after the warm-up ones
+            min_soak_seconds = self.config["window_seconds"] * (self.config["soak_warmup_windows"] + 2)
+            if self.config["soak_hours"] * 3600 < min_soak_seconds:
+                raise ValueError(
+                    f"soak_hours={self.config['soak_hours']} is too short for {self.config['window_seconds']}s windows "
+                    f"and {self.config['soak_warmup_windows']} warm-up windows; run at least {min_soak_seconds / 3600:.3f} hours "
+                    "or shorten window_seconds"
+                )
+        self.output_dir = self.config["output_dir"]
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.stop_event = threading.Event()
+        self.stopped = False
+        self.started_at = datetime.now().isoformat()
+        self.started_monotonic = time.monotonic()
+        self.iterations = 0
+        self.total_flow_runs = 0
+        self.total_flow_failures = 0
+        self.window = AggregationWindow(0)
+        self.recent_windows: deque = deque(maxlen=self.config["max_windows_in_memory"])
+        self.soak_samples: deque = deque(maxlen=100000)
+        self.spill_handler = self._create_spill_handler()
+        # Flows run off the main thread so Prefect does not swap out our SIGTERM handler
+        # and abort the in-flight flow; the main thread only waits on the result
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="healthguard360-flow")
+
+    def _create_spill_handler(self) -> RotatingFileHandler:
+        # Held on the instance rather than attached to a named logger, so no entry is left
+        # in logging's global registry once the daemon is closed
+        handler = RotatingFileHandler(
+            os.path.join(self.output_dir, "windows.jsonl"),
+            maxBytes=self.config["spill_max_bytes"],
+            backupCount=self.config["spill_max_files"]
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        return handler
+
+    def _spill(self, summary: Dict[str, Any]) -> None:
+        self.spill_handler.handle(logging.makeLogRecord({"msg": json.dumps(summary), "levelno": logging.INFO, "levelname": "INFO"}))
+
+    def request_stop(self, signum: Optional[int] = None, frame: Any = None) -> None:
+        if signum is not None:
+            logger.info(f"🛑 Received signal {signum}, finishing in-flight flow before shutdown")
+        self.stop_event.set()
+
+    def install_signal_handlers(self) -> None:
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+    def run_iteration(self) -> None:
+        """Run every configured flow once and fold the results into the current window"""
+        for flow_name in self.config["flows"]:
+            if self.stop_event.is_set():
+                return
+            started = time.perf_counter()
+            try:
+                events, gauges = self.executor.submit(FLOW_RUNNERS[flow_name], self.config, self.iterations).result()
+                failed = False
+            except Exception as exc:
+                logger.exception(f"❌ Flow {flow_name} failed: {exc}")
+                events, gauges, failed = [], {}, True
+                self.total_flow_failures += 1
+            self.window.record_flow(flow_name, (time.perf_counter() - started) * 1000, events, gauges, failed)
+            self.total_flow_runs += 1
+        self.window.sample_memory()
+        self.iterations += 1
+
+    def rotate_window(self) -> Dict[str, Any]:
+        """Close the current window, spill it to disk and start a new one"""
+        gc.collect()
+        self.window.rss_after_gc_mb = current_rss_mb()
+        self.window.sample_memory()
+        summary = self.window.summary()
+        self._spill(summary)
+        self.recent_windows.append(summary)
+        if summary["flow_latency_ms"]["count"] and summary["rss_after_gc_mb"] is not None:
+            self.soak_samples.append({
+                "elapsed_hours": (time.monotonic() - self.started_monotonic) / 3600,
+                "rss_mb": summary["rss_after_gc_mb"],
+                "flow_p95_ms": summary["flow_latency_ms"]["p95"],
+            })
+        self.window = AggregationWindow(self.window.index + 1)
+        return summary
+
+    def health_snapshot(self) -> Dict[str, Any]:
+        last_window = self.recent_windows[-1] if self.recent_windows else None
+        snapshot = {
+            "timestamp": datetime.now().isoformat(),
+            "started_at": self.started_at,
+            "uptime_seconds": round(time.monotonic() - self.started_monotonic, 2),
+            "status": "stopped" if self.stopped else "stopping" if self.stop_event.is_set() else "running",
+            "iterations": self.iterations,
+            "total_flow_runs": self.total_flow_runs,
+            "total_flow_failures": self.total_flow_failures,
+            "rss_mb": current_rss_mb(),
+            "windows_completed": self.window.index,
+            "current_window": self.window.summary(),
+            "last_window": last_window,
+        }
+        if self.config["soak_hours"]:
+            snapshot["soak"] = soak_report(list(self.soak_samples), self.config)
+        return snapshot
+
+    def write_health_snapshot(self) -> Dict[str, Any]:
+        snapshot = self.health_snapshot()
+        self._write_json("health.json", snapshot)
+        logger.info(f"💓 Health: {snapshot['iterations']} iterations, {snapshot['total_flow_failures']} failures, RSS {snapshot['rss_mb']}MB")
+        return snapshot
+
+    def _write_json(self, filename: str, data: Dict[str, Any]) -> None:
+        # Write-then-rename so readers never see a half-written file
+        path = os.path.join(self.output_dir, filename)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2)
+        os.replace(temp_path, path)
+
+    def flush(self) -> None:
+        """Spill the partial window and flush buffered output"""
+        if self.window.flow_runs:
+            self.rotate_window()
+        self.spill_handler.flush()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        self.spill_handler.close()
+
+    def run(self) -> Dict[str, Any]:
+        """Run until stopped by a signal or until the soak duration has elapsed"""
+        interval = self.config["interval_seconds"]
+        soak_seconds = self.config["soak_hours"] * 3600 if self.config["soak_hours"] else None
+        logger.info(f"🚀 Starting HealthGuard360 monitoring daemon: flows={self.config['flows']}, interval={interval}s")
+        next_run = next_health = time.monotonic()
+        window_deadline = time.monotonic() + self.config["window_seconds"]
+        try:
+            while not self.stop_event.is_set():
+                now = time.monotonic()
+                if soak_seconds is not None and now - self.started_monotonic >= soak_seconds:
+                    logger.info("⏱️ Soak duration reached")
+                    break
+                if now >= next_run:
+                    self.run_iteration()
+                    if interval:
+                        # Fixed-rate schedule: skip missed slots rather than bursting to catch up
+                        next_run += interval
+                        behind = time.monotonic() - next_run
+                        if behind > 0:
+                            next_run += interval * (behind // interval + 1)
+                    else:
+                        next_run = time.monotonic()
+                now = time.monotonic()
+                if now >= window_deadline:
+                    self.rotate_window()
+                    window_deadline = now + self.config["window_seconds"]
+                if now >= next_health:
+                    self.write_health_snapshot()
+                    next_health = now + self.config["health_interval_seconds"]
+                self.stop_event.wait(max(min(next_run, window_deadline, next_health) - time.monotonic(), 0))
+        finally:
+            self.stop_event.set()
+            self.flush()
+            self.stopped = True
+            final = self.write_health_snapshot()
+            if soak_seconds is not None:
+                self._write_json("soak_report.json", final["soak"])
+            self.close()
+            logger.info("✅ HealthGuard360 monitoring daemon stopped")
+        return final
+
+
+def run_daemon(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Create a daemon with signal handlers installed and run it to completion"""
+    daemon = MonitoringDaemon(config)
+    daemon.install_signal_handlers()
+    return daemon.run()
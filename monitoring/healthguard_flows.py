@@ -6,8 +6,14 @@ This module monitors and visualizes data flow through your healthcare compliance
 from prefect import flow, task, get_run_logger
 import json
 from datetime import datetime
+import time
 from typing import Dict, Any, List, Optional
 
+import numpy as np
+
+from ai_backend import analyze_documents, run_scan_load_test
+from workload import WorkloadSchedule, generate_schedule
+
 # ============================================================================
 # HEALTHGUARD360 SYSTEM COMPONENTS
 # ============================================================================
@@ -56,12 +62,24 @@ def monitor_document_upload(user_id: str, document_name: str, file_size: int, fi
     return flow_data
 
 @task
-def monitor_compliance_scan(user_id: str, document_id: str, scan_type: str, document_content: str) -> Dict[str, Any]:
+def monitor_compliance_scan(
+    user_id: str,
+    document_id: str,
+    scan_type: str,
+    document_content: str,
+    analysis_result: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Monitor compliance scanning flow; `analysis_result` carries a measured AIAnalysisClient result"""
     logger = get_run_logger()
     timestamp = datetime.now().isoformat()
     logger.info(f"🔍 Compliance Scan: {scan_type} for document {document_id}")
     analysis_duration = 3000
     issues_found = len([word for word in document_content.lower().split() if word in ['patient', 'medical', 'health']])
+    status = "success"
+    if analysis_result is not None:
+        analysis_duration = analysis_result["latency_ms"]
+        issues_found = analysis_result["issues_found"]
+        status = analysis_result["status"]
     flow_data = {
         "timestamp": timestamp,
         "user_id": user_id,
@@ -70,12 +88,14 @@ def monitor_compliance_scan(user_id: str, document_id: str, scan_type: str, docu
         "scan_type": scan_type,
         "component": "ai_analysis",
         "subsystem": "compliance_checker",
-        "status": "success",
+        "status": status,
         "flow_step": "compliance_analysis",
         "duration_ms": analysis_duration,
         "issues_found": issues_found,
         "data_flow": ["document_retrieval", "ai_analysis", "compliance_check", "issue_identification", "result_storage"]
     }
+    if analysis_result is not None and analysis_result.get("error"):
+        flow_data["error"] = analysis_result["error"]
     logger.info(f"📊 Scan Flow Data: {json.dumps(flow_data, indent=2)}")
     return flow_data
 
@@ -172,6 +192,65 @@ def generate_system_summary(flow_data: List[Dict[str, Any]]) -> Dict[str, Any]:
     logger.info(f"📊 System Summary Data: {json.dumps(summary, indent=2)}")
     return summary
 
+# ============================================================================
+# WORKLOAD DISPATCH
+# ============================================================================
+
+SAMPLE_DOCUMENT_WORDS = (
+    "This policy describes how patient medical records and health information "
+    "are stored accessed and shared in line with HIPAA and GDPR requirements"
+).split()
+
+def build_document_content(word_count: int) -> str:
+    """Build synthetic document text of a given word count for compliance scans"""
+    words = (SAMPLE_DOCUMENT_WORDS * (word_count // len(SAMPLE_DOCUMENT_WORDS) + 1))[:word_count]
+    return " ".join(words)
+
+def analyze_scheduled_scans(
+    schedule: WorkloadSchedule,
+    backend_config: Optional[Dict[str, Any]] = None,
+    client_config: Optional[Dict[str, Any]] = None,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """Run every scheduled compliance scan through AIAnalysisClient ahead of dispatch.
+
+    Scans arrive at their schedule start offsets, so concurrent user sessions share
+    the client's batching, concurrency limit, retries and circuit breaker.
+    """
+    if "compliance_scan" not in schedule.operation_names:
+        return {"results": {}, "elapsed_ms": 0.0, "client": {}, "backend": {}}
+    rows = np.flatnonzero(schedule.op_codes == schedule.operation_names.index("compliance_scan"))
+    operations = [schedule.operation_at(int(row)) for row in rows]
+    documents = [
+        {"document_id": f"doc_{operation['sequence']}", "content": build_document_content(operation["params"].get("document_length", 50))}
+        for operation in operations
+    ]
+    run = analyze_documents(documents, backend_config=backend_config, client_config=client_config, arrivals_ms=schedule.start_offset_ms[rows], seed=seed)
+    run["results"] = {operation["sequence"]: result for operation, result in zip(operations, run["results"])}
+    return run
+
+def run_scheduled_operation(operation: Dict[str, Any], analysis_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Dispatch one pre-generated schedule row to its monitor_* task"""
+    user_id = f"test_user_{operation['user_index'] + 1}"
+    name = operation["operation"]
+    params = operation["params"]
+    sequence = operation["sequence"]
+    if name == "user_authentication":
+        return monitor_user_authentication(user_id, params.get("action", "login"))
+    if name == "document_upload":
+        return monitor_document_upload(user_id, f"test_doc_{sequence}.pdf", params.get("file_size", 512000), params.get("file_type", "application/pdf"))
+    if name == "compliance_scan":
+        content = build_document_content(params.get("document_length", 50))
+        return monitor_compliance_scan(user_id, f"doc_{sequence}", params.get("scan_type", "GDPR"), content, analysis_result)
+    if name == "database_operations":
+        return monitor_database_operations(user_id, params.get("operation", "SELECT"), params.get("table", "compliance_reports"), params.get("record_count", 1))
+    if name == "training_progress":
+        return monitor_training_progress(user_id, params.get("module_name", "HIPAA Compliance"), params.get("progress_percentage", 0))
+    if name == "notification_system":
+        message = build_document_content(params.get("message_length", 20))
+        return monitor_notification_system(user_id, params.get("notification_type", "scan_complete"), message, params.get("channel", "email"))
+    raise ValueError(f"Unknown scheduled operation: {name}")
+
 # ============================================================================
 # MAIN DATA FLOW MONITORING FLOWS
 # ============================================================================
@@ -218,34 +297,95 @@ def monitor_complete_user_journey(
     }
 
 @flow(name="healthguard360-performance-test")
-def performance_testing_flow(num_users: int = 5, operations_per_user: int = 3):
+def performance_testing_flow(
+    num_users: int = 5,
+    operations_per_user: int = 3,
+    workload_spec: Optional[Dict[str, Any]] = None,
+    seed: Optional[int] = None,
+    apply_think_time: bool = False,
+    use_ai_client: bool = False,
+    ai_backend_config: Optional[Dict[str, Any]] = None,
+    ai_client_config: Optional[Dict[str, Any]] = None
+):
     logger = get_run_logger()
     logger.info(f"🧪 Starting Performance Test: {num_users} users, {operations_per_user} operations each")
+    generation_start = time.perf_counter()
+    schedule = generate_schedule(num_users, operations_per_user, workload_spec, seed)
+    generation_ms = (time.perf_counter() - generation_start) * 1000
+    schedule_summary = schedule.summary()
+    logger.info(f"🗓️ Generated schedule of {len(schedule)} operations in {generation_ms:.2f}ms (seed={schedule.seed})")
+    logger.info(f"📊 Operation Mix: {json.dumps(schedule_summary['operation_mix'])}")
+    scan_analysis = None
+    if use_ai_client:
+        scan_analysis = analyze_scheduled_scans(schedule, ai_backend_config, ai_client_config, schedule.seed or 0)
+        logger.info(f"🤖 Analysed {len(scan_analysis['results'])} scans through the AI client: {json.dumps(scan_analysis['client'])}")
     all_flow_data = []
-    for user_num in range(num_users):
-        user_id = f"test_user_{user_num + 1}"
-        logger.info(f"Testing user: {user_id}")
-        for op_num in range(operations_per_user):
-            if op_num == 0:
-                data = monitor_user_authentication(user_id, "login")
-            elif op_num == 1:
-                data = monitor_document_upload(user_id, f"test_doc_{user_num}.pdf", 512000, "application/pdf")
-            else:
-                data = monitor_compliance_scan(user_id, f"doc_{user_num}_{op_num}", "GDPR", "Sample content for testing")
-            all_flow_data.append(data)
+    for operation in schedule:
+        analysis_result = scan_analysis["results"].get(operation["sequence"]) if scan_analysis else None
+        data = run_scheduled_operation(operation, analysis_result)
+        all_flow_data.append(data)
+        # Users run one after another, so sleeping paces each user's session; without
+        # apply_think_time the sampled think time is reported but not waited out
+        if apply_think_time and operation["think_time_ms"] > 0:
+            time.sleep(operation["think_time_ms"] / 1000)
     summary = generate_system_summary(all_flow_data)
     logger.info(f"✅ Performance Test Completed: {len(all_flow_data)} total operations")
+    ai_analysis = None
+    if scan_analysis:
+        scan_results = list(scan_analysis["results"].values())
+        ai_analysis = {
+            "scans": len(scan_results),
+            "failed_scans": sum(1 for result in scan_results if result["status"] != "success"),
+            "elapsed_ms": round(scan_analysis["elapsed_ms"], 2),
+            "client": scan_analysis["client"],
+            "backend": scan_analysis["backend"]
+        }
     return {
         "flow_data": all_flow_data,
         "summary": summary,
+        "schedule": schedule_summary,
+        "ai_analysis": ai_analysis,
         "performance_metrics": {
             "total_operations": len(all_flow_data),
             "total_users": num_users,
             "operations_per_user": operations_per_user,
-            "average_response_time": summary["average_duration_ms"]
+            "average_response_time": summary["average_duration_ms"],
+            "operation_mix": schedule_summary["operation_mix"],
+            "average_think_time_ms": schedule_summary["average_think_time_ms"],
+            "think_time_applied": apply_think_time,
+            "schedule_generation_ms": round(generation_ms, 2)
         }
     }
 
+@flow(name="healthguard360-ai-scan-throughput")
+def ai_scan_throughput_flow(
+    num_scans: int = 200,
+    backend_config: Optional[Dict[str, Any]] = None,
+    client_config: Optional[Dict[str, Any]] = None,
+    arrival_rate_per_hour: Optional[float] = None,
+    time_scale: float = 0.01,
+    seed: int = 42
+):
+    logger = get_run_logger()
+    mode = f"{arrival_rate_per_hour} scans/hour arrivals" if arrival_rate_per_hour else "saturated"
+    logger.info(f"🤖 Starting AI Scan Throughput Test: {num_scans} scans, {mode}")
+    results = run_scan_load_test(
+        num_scans=num_scans,
+        backend_config=backend_config,
+        client_config=client_config,
+        arrival_rate_per_hour=arrival_rate_per_hour,
+        time_scale=time_scale,
+        seed=seed
+    )
+    logger.info(f"📈 Throughput: {results['scans_per_hour']} scans/hour, p95 latency {results['latency_ms']['p95']}ms, error rate {results['error_rate']}")
+    logger.info(f"📊 AI Scan Throughput Data: {json.dumps(results, indent=2)}")
+    # meets_latency_target is None in saturated mode, where queueing dominates latency
+    missed = [target for target in ("meets_throughput_target", "meets_latency_target", "meets_error_target") if results[target] is False]
+    if missed:
+        logger.warning(f"⚠️ AI analysis stage is missing README performance targets: {', '.join(missed)}")
+    logger.info("✅ AI Scan Throughput Test Completed")
+    return results
+
 def run_monitoring_demo():
     print("🏥 HealthGuard360 Data Flow Monitoring Demo")
     print("=" * 50)
@@ -4,6 +4,8 @@ HealthGuard360 Data Flow Monitoring Runner
 Run this script to monitor and visualize your system's data flow
 """
 
+import argparse
+import logging
 import os
 import sys
 from datetime import datetime
@@ -12,6 +14,7 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from healthguard_flows import monitor_complete_user_journey, performance_testing_flow
+from daemon import DEFAULT_DAEMON_CONFIG, FLOW_RUNNERS, run_daemon
 
 def main():
     """Main function to run HealthGuard360 data flow monitoring"""
@@ -66,6 +69,57 @@ def main():
         print(f"❌ Error during monitoring: {e}")
         return {"status": "error", "message": str(e)}
 
+def configure_daemon_logging():
+    """Send the daemon's own INFO logs to stderr.
+
+    Prefect configures the root logger at WARNING when it is imported, so
+    logging.basicConfig() would be a no-op here; configure our logger directly.
+    """
+    daemon_logger = logging.getLogger("healthguard360.daemon")
+    daemon_logger.setLevel(logging.INFO)
+    if not daemon_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(name)s - %(message)s"))
+        daemon_logger.addHandler(handler)
+    daemon_logger.propagate = False
+
+def run_daemon_mode(args):
+    """Run the monitoring flows continuously until SIGTERM/SIGINT or the soak duration ends"""
+    configure_daemon_logging()
+    print("🏥 HealthGuard360 Continuous Monitoring Daemon")
+    print("=" * 50)
+    try:
+        final = run_daemon({
+            "flows": args.flows,
+            "interval_seconds": args.interval,
+            "window_seconds": args.window,
+            "health_interval_seconds": args.health_interval,
+            "output_dir": args.output_dir,
+            "soak_hours": args.soak_hours,
+            "use_ai_client": args.use_ai_client,
+        })
+    except ValueError as e:
+        print(f"❌ Invalid daemon configuration: {e}")
+        return {"status": "error", "message": str(e)}
+    print(f"\n📊 Iterations: {final['iterations']}, flow failures: {final['total_flow_failures']}, RSS: {final['rss_mb']}MB")
+    if "soak" in final:
+        print(f"🧪 Soak verdict: {final['soak']['verdict'].upper()}")
+        print(f"   📄 Report written to {os.path.join(args.output_dir, 'soak_report.json')}")
+    return {"status": final["status"], "health": final}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="HealthGuard360 data flow monitoring")
+    parser.add_argument("--daemon", action="store_true", help="run flows continuously instead of a single demo run")
+    parser.add_argument("--flows", nargs="+", default=DEFAULT_DAEMON_CONFIG["flows"], choices=list(FLOW_RUNNERS), help="flows to run each iteration")
+    parser.add_argument("--interval", type=float, default=DEFAULT_DAEMON_CONFIG["interval_seconds"], help="seconds between iterations, 0 for a continuous loop")
+    parser.add_argument("--window", type=float, default=DEFAULT_DAEMON_CONFIG["window_seconds"], help="seconds per aggregation window")
+    parser.add_argument("--health-interval", type=float, default=DEFAULT_DAEMON_CONFIG["health_interval_seconds"], help="seconds between health snapshots")
+    parser.add_argument("--output-dir", default=DEFAULT_DAEMON_CONFIG["output_dir"], help="directory for window spill files and health snapshots")
+    parser.add_argument("--soak-hours", type=float, default=DEFAULT_DAEMON_CONFIG["soak_hours"], help="stop after this many hours and report memory and latency drift")
+    parser.add_argument("--use-ai-client", action="store_true", help="send performance-flow compliance scans through the emulated AI client")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    result = main()
+    args = parse_args()
+    result = run_daemon_mode(args) if args.daemon or args.soak_hours else main()
     print(f"\n📊 Final Status: {result['status']}") 
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The monitoring modules import each other by bare name, as run_monitoring.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,99 @@
+import pytest
+
+from ai_backend import CircuitBreaker, EmulatedAIBackend, analyze_documents, run_scan_load_test
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.time_scale = 1.0
+
+    def now_ms(self):
+        return self.now
+
+
+def test_circuit_breaker_opens_probes_once_and_closes_on_success():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout_ms=1000, clock=clock)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 1000
+    assert breaker.allow()
+    assert not breaker.allow()  # only one half-open probe at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.times_opened == 1
+
+
+def test_circuit_breaker_reopens_when_probe_fails_and_ignores_throttling():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_ms=1000, clock=clock)
+    for _ in range(10):
+        breaker.record_throttle()
+    assert breaker.state == "closed"
+
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now = 1500
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.opened_at_ms == 1500
+    assert breaker.times_opened == 2
+
+
+def test_open_circuit_stops_queued_batches_from_reaching_the_backend():
+    result = run_scan_load_test(
+        num_scans=400,
+        backend_config={"error_rate": 1.0, "rate_limit_per_minute": 0, "max_concurrency": 2},
+        client_config={"max_concurrency": 2, "circuit_failure_threshold": 5, "circuit_reset_timeout_ms": 10 ** 9},
+    )
+    assert result["client"]["circuit_opens"] == 1
+    # Only the batches that tripped the breaker, plus those already in flight, hit the backend
+    assert result["backend"]["requests"] <= 5 + 2
+    assert result["completed_scans"] == 0
+    assert result["failures_by_type"]["CircuitOpenError"] > 0
+
+
+def test_rate_limited_batches_retry_until_they_succeed():
+    result = run_scan_load_test(
+        num_scans=20,
+        backend_config={"error_rate": 0.0, "rate_limit_per_minute": 2},
+        client_config={"batch_size": 4, "max_retries": 10},
+    )
+    assert result["completed_scans"] == 20
+    assert result["backend"]["rate_limited"] > 0
+    assert result["client"]["retries"] > 0
+
+
+def test_saturated_run_batches_requests_and_skips_latency_target():
+    # Every scan is queued at once, so with a batch wait far beyond any scheduler delay
+    # each batch fills to batch_size regardless of host load
+    result = run_scan_load_test(
+        num_scans=40,
+        backend_config={"error_rate": 0.0},
+        client_config={"batch_size": 4, "batch_wait_ms": 100000},
+    )
+    assert result["average_batch_size"] == 4
+    assert result["meets_latency_target"] is None
+    assert result["meets_error_target"] is True
+
+    paced = run_scan_load_test(num_scans=10, backend_config={"error_rate": 0.0}, arrival_rate_per_hour=3600)
+    assert isinstance(paced["meets_latency_target"], bool)
+
+
+def test_analyze_documents_returns_one_result_per_document_in_order():
+    documents = [{"document_id": f"doc_{index}", "content": "patient medical data " * index} for index in range(6)]
+    run = analyze_documents(documents, backend_config={"error_rate": 0.0})
+    assert [result["document_id"] for result in run["results"]] == [document["document_id"] for document in documents]
+    assert all(result["status"] == "success" and result["latency_ms"] > 0 for result in run["results"])
+    assert run["results"][3]["issues_found"] == 6
+
+
+def test_backend_rejects_non_numeric_latency_choice():
+    with pytest.raises(ValueError, match="latency_ms"):
+        EmulatedAIBackend({"latency_ms": {"distribution": "choice", "values": ["slow"]}})
@@ -0,0 +1,136 @@
+import json
+import logging
+
+import pytest
+
+pytest.importorskip("prefect")
+
+import daemon
+from daemon import DEFAULT_DAEMON_CONFIG, LatencyHistogram, MonitoringDaemon, soak_report
+
+
+def fake_runner(config, iteration):
+    events = [
+        {"component": "database", "status": "success", "duration_ms": 50},
+        {"component": "ai_analysis", "status": "success", "duration_ms": 3000},
+    ]
+    return events, {"iteration": iteration}
+
+
+def failing_runner(config, iteration):
+    raise RuntimeError("backend down")
+
+
+@pytest.fixture
+def make_daemon(tmp_path, monkeypatch):
+    monkeypatch.setitem(daemon.FLOW_RUNNERS, "fake", fake_runner)
+    monkeypatch.setitem(daemon.FLOW_RUNNERS, "failing", failing_runner)
+    created = []
+
+    def factory(**overrides):
+        config = {"flows": ["fake"], "output_dir": str(tmp_path), "interval_seconds": 0, **overrides}
+        instance = MonitoringDaemon(config)
+        created.append(instance)
+        return instance
+
+    yield factory
+    for instance in created:
+        instance.close()
+
+
+def test_histogram_percentiles_land_in_the_right_bucket():
+    histogram = LatencyHistogram()
+    histogram.add([10.0] * 90 + [1000.0] * 10)
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["mean"] == pytest.approx(109.0)
+    # Percentiles report the bucket's upper edge, so allow one bucket of slack
+    assert 10.0 <= summary["p50"] <= 10.0 * 1.1
+    assert 1000.0 <= summary["p95"] <= 1000.0 * 1.1
+    assert LatencyHistogram().percentile(99) == 0.0
+
+
+def test_histogram_memory_is_fixed_regardless_of_sample_count():
+    histogram = LatencyHistogram()
+    size = histogram.counts.nbytes
+    histogram.add(list(range(1, 100000)))
+    assert histogram.counts.nbytes == size
+    assert histogram.count == 99999
+
+
+def test_rotate_window_spills_summary_and_starts_a_new_window(make_daemon, tmp_path):
+    instance = make_daemon()
+    instance.run_iteration()
+    instance.run_iteration()
+    summary = instance.rotate_window()
+    instance.flush()
+
+    assert summary["flow_runs"] == {"fake": 2}
+    assert summary["events_by_component"] == {"database": 2, "ai_analysis": 2}
+    assert summary["gauges"] == {"fake.iteration": 1}
+    assert summary["rss_after_gc_mb"] is not None
+    assert instance.window.index == 1
+    spilled = [json.loads(line) for line in (tmp_path / "windows.jsonl").read_text().splitlines()]
+    assert [window["window"] for window in spilled] == [0]
+    assert len(instance.soak_samples) == 1
+
+
+def test_daemons_do_not_register_loggers(make_daemon):
+    before = set(logging.Logger.manager.loggerDict)
+    for _ in range(3):
+        make_daemon().close()
+    assert set(logging.Logger.manager.loggerDict) == before
+
+
+def test_recent_windows_are_bounded(make_daemon):
+    instance = make_daemon(max_windows_in_memory=3)
+    for _ in range(10):
+        instance.run_iteration()
+        instance.rotate_window()
+    assert len(instance.recent_windows) == 3
+    assert instance.recent_windows[-1]["window"] == 9
+
+
+def test_flow_failures_are_counted_without_stopping_the_daemon(make_daemon):
+    instance = make_daemon(flows=["failing", "fake"])
+    instance.run_iteration()
+    assert instance.total_flow_failures == 1
+    assert instance.total_flow_runs == 2
+    assert instance.window.summary()["flow_failures"] == {"failing": 1}
+
+
+def test_run_stops_on_request_and_flushes_the_partial_window(make_daemon, tmp_path):
+    instance = make_daemon(window_seconds=3600, health_interval_seconds=3600)
+    instance.request_stop()
+    final = instance.run()
+    assert final["status"] == "stopped"
+    assert json.loads((tmp_path / "health.json").read_text())["status"] == "stopped"
+
+
+def test_soak_shorter_than_warmup_plus_two_windows_is_rejected(make_daemon):
+    with pytest.raises(ValueError, match="too short"):
+        make_daemon(soak_hours=0.1, window_seconds=300, soak_warmup_windows=2)
+
+
+def soak_samples(rss, p95):
+    return [{"elapsed_hours": index / 12, "rss_mb": value, "flow_p95_ms": latency} for index, (value, latency) in enumerate(zip(rss, p95))]
+
+
+def test_soak_report_flags_steady_memory_growth_after_warmup():
+    rss = [100, 150] + [200 + 10 * index for index in range(48)]
+    report = soak_report(soak_samples(rss, [1000] * 50), DEFAULT_DAEMON_CONFIG)
+    assert report["windows"] == 48
+    assert report["rss_slope_mb_per_hour"] == pytest.approx(120, rel=0.01)
+    assert report["verdict"] == "leak_suspected"
+
+
+def test_soak_report_is_stable_for_flat_memory_and_latency():
+    report = soak_report(soak_samples([200] * 50, [1000] * 50), DEFAULT_DAEMON_CONFIG)
+    assert report["verdict"] == "stable"
+
+
+def test_soak_report_flags_latency_drift_and_short_runs():
+    p95 = [1000] * 25 + [2000] * 25
+    report = soak_report(soak_samples([200] * 50, p95), DEFAULT_DAEMON_CONFIG)
+    assert report["verdict"] == "latency_degraded"
+    assert soak_report(soak_samples([200] * 3, [1000] * 3), DEFAULT_DAEMON_CONFIG)["verdict"] == "insufficient_data"
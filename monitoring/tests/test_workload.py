@@ -0,0 +1,98 @@
+import copy
+import json
+
+import pytest
+
+from workload import DEFAULT_WORKLOAD_SPEC, OPERATIONS, generate_schedule, load_workload_spec, validate_workload_spec
+
+
+def spec_with(**overrides):
+    spec = copy.deepcopy(DEFAULT_WORKLOAD_SPEC)
+    spec.update(overrides)
+    return spec
+
+
+def test_schedule_is_reproducible_for_a_fixed_seed():
+    first = generate_schedule(20, 10, seed=7)
+    second = generate_schedule(20, 10, seed=7)
+    assert list(first) == list(second)
+    assert list(first) != list(generate_schedule(20, 10, seed=8))
+
+
+def test_schedule_covers_every_operation_and_starts_sessions_with_initial_operation():
+    schedule = generate_schedule(200, 20, seed=1)
+    assert len(schedule) == 4000
+    assert set(schedule.operation_counts()) == set(OPERATIONS)
+    assert all(count > 0 for count in schedule.operation_counts().values())
+    first_ops = {schedule.operation_at(user * 20)["operation"] for user in range(200)}
+    assert first_ops == {"user_authentication"}
+
+
+def test_operation_params_are_decoded_and_within_bounds():
+    schedule = generate_schedule(50, 20, seed=3)
+    for operation in schedule:
+        params = operation["params"]
+        if operation["operation"] == "document_upload":
+            assert 1024 <= params["file_size"] <= 52428800
+            assert isinstance(params["file_size"], int)
+        elif operation["operation"] == "compliance_scan":
+            assert params["scan_type"] in ("HIPAA", "GDPR", "SOC2")
+        elif operation["operation"] == "database_operations":
+            assert params["record_count"] >= 1
+
+
+def test_start_offsets_accumulate_think_time_per_user():
+    rows = list(generate_schedule(3, 4, seed=5))
+    for user in range(3):
+        session = rows[user * 4:(user + 1) * 4]
+        assert session[0]["start_offset_ms"] == 0
+        for previous, current in zip(session, session[1:]):
+            assert current["start_offset_ms"] == pytest.approx(previous["start_offset_ms"] + previous["think_time_ms"], abs=0.02)
+
+
+def test_numeric_choice_think_time_uses_the_choice_values():
+    spec = spec_with(think_time_ms={"distribution": "choice", "values": [100, 5000]})
+    schedule = generate_schedule(10, 10, spec, seed=2)
+    assert {operation["think_time_ms"] for operation in schedule} == {100.0, 5000.0}
+
+
+def test_negative_think_time_samples_are_clipped_to_zero():
+    spec = spec_with(think_time_ms={"distribution": "normal", "mean": 0, "std": 100})
+    schedule = generate_schedule(20, 10, spec, seed=4)
+    assert schedule.think_time_ms.min() == 0
+    assert (schedule.think_time_ms == 0).any()
+    offsets = schedule.start_offset_ms.reshape(20, 10)
+    assert (offsets[:, 1:] >= offsets[:, :-1]).all()
+    assert schedule.summary()["total_think_time_ms"] >= 0
+
+
+@pytest.mark.parametrize("think_time, message", [
+    ({"distribution": "lognormal", "sigma": 1.0}, "missing required keys"),
+    ({"distribution": "lognormal", "median": 0}, "median"),
+    ({"distribution": "exponential"}, "missing required keys"),
+    ({"distribution": "poisson"}, "missing required keys"),
+    ({"distribution": "constant"}, "missing required keys"),
+    ({"distribution": "choice", "values": ["fast", "slow"]}, "must be numbers"),
+    ({"distribution": "choice", "values": [1, 2], "weights": [-1, 2]}, "non-negative"),
+    ({"distribution": "zipf"}, "unknown distribution"),
+])
+def test_invalid_distributions_are_rejected_with_their_label(think_time, message):
+    with pytest.raises(ValueError, match=message) as excinfo:
+        validate_workload_spec(spec_with(think_time_ms=think_time))
+    assert "think_time_ms" in str(excinfo.value)
+
+
+def test_unknown_operation_and_bad_weights_are_rejected():
+    with pytest.raises(ValueError, match="Unknown operation"):
+        validate_workload_spec({"operations": {"delete_everything": {"weight": 1}}})
+    with pytest.raises(ValueError, match="sum to a positive value"):
+        validate_workload_spec({"operations": {"user_authentication": {"weight": 0}}})
+
+
+def test_load_workload_spec_validates_param_distributions(tmp_path):
+    path = tmp_path / "workload.json"
+    path.write_text(json.dumps({
+        "operations": {"compliance_scan": {"weight": 1, "params": {"document_length": {"distribution": "lognormal"}}}}
+    }))
+    with pytest.raises(ValueError, match="compliance_scan.document_length"):
+        load_workload_spec(str(path))
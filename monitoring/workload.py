@@ -0,0 +1,304 @@
+"""
+HealthGuard360 Workload Mix Engine
+Declarative, weighted workload specs for performance testing, with the whole
+operation schedule pre-generated by vectorised NumPy sampling.
+"""
+
+import json
+import os
+from typing import Dict, Any, List, Optional, Iterator
+
+import numpy as np
+
+# ============================================================================
+# WORKLOAD SPECIFICATION
+# ============================================================================
+
+# Operation names map one-to-one onto the monitor_* tasks in healthguard_flows.py
+OPERATIONS = [
+    "user_authentication",
+    "document_upload",
+    "compliance_scan",
+    "database_operations",
+    "training_progress",
+    "notification_system",
+]
+
+DISTRIBUTIONS = ["constant", "uniform", "normal", "lognormal", "exponential", "poisson", "choice"]
+
+# Keys a distribution spec cannot be sampled without
+REQUIRED_DISTRIBUTION_KEYS = {
+    "constant": ["value"],
+    "lognormal": ["median"],
+    "exponential": ["mean"],
+    "poisson": ["lam"],
+    "choice": ["values"],
+}
+
+DEFAULT_WORKLOAD_SPEC: Dict[str, Any] = {
+    "seed": 42,
+    "initial_operation": "user_authentication",
+    "think_time_ms": {"distribution": "exponential", "mean": 800, "max": 10000},
+    "operations": {
+        "user_authentication": {
+            "weight": 0.10,
+            "params": {
+                "action": {"distribution": "choice", "values": ["login", "logout", "refresh_session"], "weights": [0.6, 0.2, 0.2]},
+            },
+        },
+        "document_upload": {
+            "weight": 0.15,
+            "params": {
+                "file_size": {"distribution": "lognormal", "median": 512000, "sigma": 1.0, "min": 1024, "max": 52428800, "integer": True},
+                "file_type": {"distribution": "choice", "values": ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "text/plain"], "weights": [0.7, 0.2, 0.1]},
+            },
+        },
+        "compliance_scan": {
+            "weight": 0.20,
+            "params": {
+                "scan_type": {"distribution": "choice", "values": ["HIPAA", "GDPR", "SOC2"], "weights": [0.6, 0.25, 0.15]},
+                "document_length": {"distribution": "lognormal", "median": 400, "sigma": 0.8, "min": 10, "max": 20000, "integer": True},
+            },
+        },
+        "database_operations": {
+            "weight": 0.35,
+            "params": {
+                "operation": {"distribution": "choice", "values": ["SELECT", "INSERT", "UPDATE", "DELETE"], "weights": [0.6, 0.2, 0.15, 0.05]},
+                "table": {"distribution": "choice", "values": ["compliance_reports", "documents", "audit_logs", "training_progress"]},
+                "record_count": {"distribution": "poisson", "lam": 5, "min": 1, "integer": True},
+            },
+        },
+        "training_progress": {
+            "weight": 0.10,
+            "params": {
+                "module_name": {"distribution": "choice", "values": ["HIPAA Compliance", "Patient Data Security", "Breach Response", "GDPR Essentials"]},
+                "progress_percentage": {"distribution": "uniform", "low": 0, "high": 100, "integer": True},
+            },
+        },
+        "notification_system": {
+            "weight": 0.10,
+            "params": {
+                "notification_type": {"distribution": "choice", "values": ["scan_complete", "training_reminder", "compliance_alert"], "weights": [0.5, 0.3, 0.2]},
+                "channel": {"distribution": "choice", "values": ["email", "in_app", "sms"], "weights": [0.5, 0.4, 0.1]},
+                "message_length": {"distribution": "normal", "mean": 120, "std": 40, "min": 20, "max": 500, "integer": True},
+            },
+        },
+    },
+}
+
+
+def load_workload_spec(path: str) -> Dict[str, Any]:
+    """Load a workload spec from a .json, .yaml or .yml file"""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8") as handle:
+        if extension in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as exc:
+                raise ImportError("PyYAML is required to load YAML workload specs: pip install pyyaml") from exc
+            spec = yaml.safe_load(handle)
+        elif extension == ".json":
+            spec = json.load(handle)
+        else:
+            raise ValueError(f"Unsupported workload spec format '{extension}', expected .json, .yaml or .yml")
+    validate_workload_spec(spec)
+    return spec
+
+
+def validate_workload_spec(spec: Dict[str, Any]) -> None:
+    """Raise ValueError if a workload spec is malformed"""
+    operations = spec.get("operations")
+    if not operations:
+        raise ValueError("Workload spec must define at least one operation")
+    for name, op_spec in operations.items():
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}', expected one of {OPERATIONS}")
+        if op_spec.get("weight", 0) < 0:
+            raise ValueError(f"Operation '{name}' has a negative weight")
+        for param_name, dist in op_spec.get("params", {}).items():
+            validate_distribution(f"{name}.{param_name}", dist)
+    if sum(op_spec.get("weight", 0) for op_spec in operations.values()) <= 0:
+        raise ValueError("Workload spec operation weights must sum to a positive value")
+    initial = spec.get("initial_operation")
+    if initial is not None and initial not in operations:
+        raise ValueError(f"initial_operation '{initial}' is not defined in the workload spec")
+    if "think_time_ms" in spec:
+        validate_distribution("think_time_ms", spec["think_time_ms"], numeric=True)
+
+
+def validate_distribution(label: str, dist: Dict[str, Any], numeric: bool = False) -> None:
+    """Raise ValueError if a single distribution spec is malformed.
+
+    `numeric` marks specs whose samples are used as numbers, so a `choice`
+    must pick between numeric values.
+    """
+    kind = dist.get("distribution")
+    if kind not in DISTRIBUTIONS:
+        raise ValueError(f"{label}: unknown distribution '{kind}', expected one of {DISTRIBUTIONS}")
+    missing = [key for key in REQUIRED_DISTRIBUTION_KEYS.get(kind, []) if key not in dist]
+    if missing:
+        raise ValueError(f"{label}: {kind} distribution is missing required keys {missing}")
+    if kind == "lognormal" and dist["median"] <= 0:
+        raise ValueError(f"{label}: lognormal 'median' must be positive")
+    if kind == "choice":
+        values = dist["values"] or []
+        weights = dist.get("weights")
+        if not values:
+            raise ValueError(f"{label}: choice distribution needs a non-empty 'values' list")
+        if weights is not None:
+            if len(weights) != len(values):
+                raise ValueError(f"{label}: 'weights' must be the same length as 'values'")
+            if any(weight < 0 for weight in weights) or sum(weights) <= 0:
+                raise ValueError(f"{label}: choice 'weights' must be non-negative and sum to a positive value")
+        if numeric and not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            raise ValueError(f"{label}: choice 'values' must be numbers")
+
+# ============================================================================
+# VECTORISED SAMPLING
+# ============================================================================
+
+def sample_distribution(rng: np.random.Generator, dist: Dict[str, Any], size: int) -> np.ndarray:
+    """Draw `size` samples from a distribution spec in a single vectorised call"""
+    kind = dist["distribution"]
+    if kind == "choice":
+        weights = dist.get("weights")
+        p = None
+        if weights is not None:
+            p = np.asarray(weights, dtype=np.float64)
+            p = p / p.sum()
+        # Categorical values are kept as compact integer codes and decoded lazily
+        return rng.choice(len(dist["values"]), size=size, p=p).astype(np.int32)
+    if kind == "constant":
+        samples = np.full(size, dist["value"], dtype=np.float64)
+    elif kind == "uniform":
+        samples = rng.uniform(dist.get("low", 0.0), dist.get("high", 1.0), size)
+    elif kind == "normal":
+        samples = rng.normal(dist.get("mean", 0.0), dist.get("std", 1.0), size)
+    elif kind == "lognormal":
+        samples = rng.lognormal(np.log(dist["median"]), dist.get("sigma", 1.0), size)
+    elif kind == "exponential":
+        samples = rng.exponential(dist["mean"], size)
+    else:
+        samples = rng.poisson(dist["lam"], size).astype(np.float64)
+    if "min" in dist or "max" in dist:
+        samples = np.clip(samples, dist.get("min", -np.inf), dist.get("max", np.inf))
+    if dist.get("integer"):
+        return np.rint(samples).astype(np.int64)
+    return samples
+
+
+def sample_numeric_distribution(rng: np.random.Generator, dist: Dict[str, Any], size: int) -> np.ndarray:
+    """Like sample_distribution, but `choice` codes are mapped back to their numeric values"""
+    samples = sample_distribution(rng, dist, size)
+    if dist["distribution"] == "choice":
+        return np.asarray(dist["values"], dtype=np.float64)[samples]
+    return samples.astype(np.float64)
+
+
+class WorkloadSchedule:
+    """Columnar, pre-sampled operation schedule for a performance run.
+
+    Rows are ordered user-major, matching the order the performance flow
+    executes them. Per-operation parameters are stored compactly: each
+    operation only holds samples for its own rows, addressed through
+    `op_slot`.
+    """
+
+    def __init__(self, spec: Dict[str, Any], num_users: int, operations_per_user: int, seed: Optional[int] = None):
+        validate_workload_spec(spec)
+        if num_users < 0 or operations_per_user < 0:
+            raise ValueError("num_users and operations_per_user must be non-negative")
+        self.spec = spec
+        self.num_users = num_users
+        self.operations_per_user = operations_per_user
+        self.seed = spec.get("seed") if seed is None else seed
+        self.operation_names: List[str] = list(spec["operations"].keys())
+
+        rng = np.random.default_rng(self.seed)
+        total = num_users * operations_per_user
+        weights = np.asarray([spec["operations"][name].get("weight", 0) for name in self.operation_names], dtype=np.float64)
+
+        self.user_index = np.repeat(np.arange(num_users, dtype=np.int32), operations_per_user)
+        self.op_codes = rng.choice(len(self.operation_names), size=total, p=weights / weights.sum()).astype(np.int8)
+        initial = spec.get("initial_operation")
+        if initial is not None and operations_per_user > 0:
+            self.op_codes.reshape(num_users, operations_per_user)[:, 0] = self.operation_names.index(initial)
+
+        if "think_time_ms" in spec:
+            # Distributions such as normal can go negative; a user cannot think for less than 0ms
+            self.think_time_ms = np.maximum(sample_numeric_distribution(rng, spec["think_time_ms"], total), 0.0)
+        else:
+            self.think_time_ms = np.zeros(total, dtype=np.float64)
+        # Offset of each operation from the start of its user's session (exclusive running sum)
+        per_user = self.think_time_ms.reshape(num_users, operations_per_user)
+        offsets = np.zeros_like(per_user)
+        np.cumsum(per_user[:, :-1], axis=1, out=offsets[:, 1:])
+        self.start_offset_ms = offsets.reshape(total)
+
+        self.op_slot = np.zeros(total, dtype=np.int64)
+        self.params: Dict[str, Dict[str, np.ndarray]] = {}
+        for code, name in enumerate(self.operation_names):
+            mask = self.op_codes == code
+            count = int(mask.sum())
+            self.op_slot[mask] = np.arange(count)
+            self.params[name] = {
+                param_name: sample_distribution(rng, dist, count)
+                for param_name, dist in spec["operations"][name].get("params", {}).items()
+            }
+
+    def __len__(self) -> int:
+        return int(self.op_codes.shape[0])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(len(self)):
+            yield self.operation_at(row)
+
+    def operation_at(self, row: int) -> Dict[str, Any]:
+        """Decode a single schedule row into a plain operation dict"""
+        name = self.operation_names[self.op_codes[row]]
+        slot = self.op_slot[row]
+        param_specs = self.spec["operations"][name].get("params", {})
+        params = {}
+        for param_name, samples in self.params[name].items():
+            dist = param_specs[param_name]
+            if dist["distribution"] == "choice":
+                params[param_name] = dist["values"][samples[slot]]
+            else:
+                params[param_name] = samples[slot].item()
+        return {
+            "sequence": row,
+            "user_index": int(self.user_index[row]),
+            "operation": name,
+            "think_time_ms": round(float(self.think_time_ms[row]), 2),
+            "start_offset_ms": round(float(self.start_offset_ms[row]), 2),
+            "params": params,
+        }
+
+    def operation_counts(self) -> Dict[str, int]:
+        """Number of scheduled operations of each type"""
+        counts = np.bincount(self.op_codes, minlength=len(self.operation_names))
+        return {name: int(counts[code]) for code, name in enumerate(self.operation_names)}
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate view of the schedule without materialising any rows"""
+        session_lengths = self.think_time_ms.reshape(self.num_users, self.operations_per_user).sum(axis=1)
+        return {
+            "seed": self.seed,
+            "total_operations": len(self),
+            "total_users": self.num_users,
+            "operations_per_user": self.operations_per_user,
+            "operation_mix": self.operation_counts(),
+            "total_think_time_ms": round(float(self.think_time_ms.sum()), 2),
+            "average_think_time_ms": round(float(self.think_time_ms.mean()), 2) if len(self) else 0,
+            "longest_session_ms": round(float(session_lengths.max()), 2) if self.num_users and len(self) else 0,
+        }
+
+
+def generate_schedule(
+    num_users: int,
+    operations_per_user: int,
+    spec: Optional[Dict[str, Any]] = None,
+    seed: Optional[int] = None
+) -> WorkloadSchedule:
+    """Pre-generate the full operation schedule for a performance run"""
+    return WorkloadSchedule(spec or DEFAULT_WORKLOAD_SPEC, num_users, operations_per_user, seed)